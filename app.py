@@ -1,11 +1,13 @@
 from flask import Flask, request, abort
-from linebot.v3 import WebhookHandler
+from linebot.v3 import WebhookParser
 from linebot.v3.messaging import (
     Configuration,
     ApiClient,
     MessagingApi,
     ReplyMessageRequest,
-    TextMessage
+    PushMessageRequest,
+    TextMessage,
+    ApiException
 )
 from linebot.v3.exceptions import InvalidSignatureError
 from linebot.v3.webhooks import MessageEvent, ImageMessageContent
@@ -14,13 +16,24 @@ from dotenv import load_dotenv
 from datetime import datetime
 import logging
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import google.generativeai as genai
-from PIL import Image
+from PIL import Image, ImageOps
 import io
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+import google_auth_httplib2
+import httplib2
 import re
+import functools
+import threading
+import atexit
+import time
+import socket
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # ログ設定
 logging.basicConfig(level=logging.INFO)
@@ -31,63 +44,109 @@ load_dotenv()
 
 app = Flask(__name__)
 
+# 必須の環境変数（未設定なら起動時にKeyErrorで止める）
+LINE_CHANNEL_ACCESS_TOKEN = os.environ['LINE_CHANNEL_ACCESS_TOKEN']
+LINE_CHANNEL_SECRET = os.environ['LINE_CHANNEL_SECRET']
+GOOGLE_API_KEY = os.environ['GOOGLE_API_KEY']
+GOOGLE_CREDENTIALS = os.environ['GOOGLE_CREDENTIALS']
+SPREADSHEET_ID = os.environ['SPREADSHEET_ID']
+LINE_AUTH_HEADER = {'Authorization': f'Bearer {LINE_CHANNEL_ACCESS_TOKEN}'}
+
 # LINE Messaging APIの設定
-configuration = Configuration(access_token=os.getenv('LINE_CHANNEL_ACCESS_TOKEN'))
-handler = WebhookHandler(os.getenv('LINE_CHANNEL_SECRET'))
+configuration = Configuration(access_token=LINE_CHANNEL_ACCESS_TOKEN)
+parser = WebhookParser(LINE_CHANNEL_SECRET)
+
+# 返信用のLINE APIクライアント（接続プールをプロセス内で使い回す）
+_LINE_API_CLIENT = ApiClient(configuration)
+_LINE_MESSAGING = MessagingApi(_LINE_API_CLIENT)
 
 # Gemini APIの設定
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 genai.configure(api_key=GOOGLE_API_KEY)
 
+# OCR用のGeminiモデル（プロセス内で使い回す。出力を安定させるため温度は0）
+_GEMINI_MODEL = genai.GenerativeModel(
+    'gemini-1.5-flash',
+    generation_config={'temperature': 0.0, 'max_output_tokens': 2048}
+)
+
 # Google Sheets APIのスコープ
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Google Sheets APIへのリクエストのタイムアウト（秒）
+SHEETS_HTTP_TIMEOUT = 10
+
+# データを追加するシート
+RANGE_NAME = 'シート1'
+
+# スプレッドシートへの書き込みをまとめる間隔（秒）と、即時書き込みに切り替える行数
+SHEET_FLUSH_INTERVAL = 2.0
+SHEET_FLUSH_MAX_ROWS = 500
+# 送信待ちとして保持する行数の上限（超えた画像の行は受け付けない）
+SHEET_MAX_PENDING_ROWS = 10000
+# 一時的なエラーで書き込みに失敗したときの再試行回数と、初回の待ち時間（秒）
+SHEET_APPEND_RETRIES = 3
+SHEET_RETRY_BACKOFF = 1.0
+
+# LINEからの画像ダウンロードのタイムアウト（接続, 読み込み）秒
+LINE_CONTENT_TIMEOUT = (3, 10)
+
+# Geminiに送る画像の長辺の上限（ピクセル）と、縮小時のJPEG品質
+MAX_IMAGE_SIDE = 1024
+RESIZED_JPEG_QUALITY = 85
+
+# LINEのコンテンツ取得用セッション（接続を使い回す）
+_LINE_SESSION = requests.Session()
+_LINE_SESSION.headers.update(LINE_AUTH_HEADER)
+_LINE_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=50))
+
+# 画像のダウンロード・OCR・返信を行うワーカー（Webhookのスレッドを塞がないようにする）
+OCR_MAX_WORKERS = 8
+_EXECUTOR = ThreadPoolExecutor(max_workers=OCR_MAX_WORKERS)
+
 # 環境変数の確認
-logger.info(f"Channel Access Token: {os.getenv('LINE_CHANNEL_ACCESS_TOKEN')[:10]}...")
-logger.info(f"Channel Secret: {os.getenv('LINE_CHANNEL_SECRET')[:10]}...")
-logger.info(f"Google API Key: {os.getenv('GOOGLE_API_KEY')[:10]}...")
-logger.info(f"Spreadsheet ID: {os.getenv('SPREADSHEET_ID')[:10]}...")
-logger.info(f"Service Account File: {os.getenv('SERVICE_ACCOUNT_FILE')}")
+logger.info(f"Channel Access Token: {LINE_CHANNEL_ACCESS_TOKEN[:10]}...")
+logger.info(f"Channel Secret: {LINE_CHANNEL_SECRET[:10]}...")
+logger.info(f"Google API Key: {GOOGLE_API_KEY[:10]}...")
+logger.info(f"Spreadsheet ID: {SPREADSHEET_ID[:10]}...")
 
 # 画像を保存するディレクトリ
 SAVE_DIR = 'images'
 if not os.path.exists(SAVE_DIR):
     os.makedirs(SAVE_DIR)
 
-# 保存済みメッセージIDを記録するファイル
-SAVED_MESSAGES_FILE = 'saved_messages.json'
+# 保存済みメッセージIDを記録するファイル（1行に1件）
+SAVED_MESSAGES_FILE = 'saved_messages.txt'
+# メモリ上に保持する保存済みメッセージIDの最大件数
+MAX_SAVED_MESSAGES = 10000
 
+@functools.lru_cache(maxsize=1)
 def get_google_sheets_service():
     """
     Google Sheets APIのサービスアカウント認証を行い、サービスオブジェクトを返す
+    認証とクライアント構築はプロセスごとに一度だけ行い、以降はキャッシュを再利用する
     """
-    # サービスアカウントファイルのパスを環境変数から取得
-    # サービスアカウントの認証情報を環境変数から取得
-    credentials_json = os.getenv('GOOGLE_CREDENTIALS')
-    if not credentials_json:
-        raise ValueError("GOOGLE_CREDENTIALS environment variable is not set")
-    
-    # JSON文字列を辞書に変換
-    credentials_info = json.loads(credentials_json)
+    # 環境変数のJSON文字列を辞書に変換
+    credentials_info = json.loads(GOOGLE_CREDENTIALS)
     
     # 認証情報を作成
     credentials = service_account.Credentials.from_service_account_info(
         credentials_info, scopes=SCOPES)
-    print(credentials)
-    return build('sheets', 'v4', credentials=credentials)
+    # 同梱のディスカバリードキュメントを使い、ネットワーク経由の取得を避ける
+    # 認証付きのHTTPクライアントを一つ作り、以降のリクエストで接続を使い回す
+    authed_http = google_auth_httplib2.AuthorizedHttp(
+        credentials, http=httplib2.Http(timeout=SHEETS_HTTP_TIMEOUT))
+    return build('sheets', 'v4', http=authed_http,
+                 cache_discovery=False, static_discovery=True)
+
+# 表のセル（タブまたはカンマで区切られ、前後の空白を除いた空でない文字列）
+_CELL_PATTERN = re.compile(r'[^\t,\s](?:[^\t,\n]*[^\t,\s])?')
 
 def convert_to_table(text):
     """
     テキストを表形式に変換する関数
     """
-    lines = text.strip().split('\n')
-    table_data = []
-    for line in lines:
-        row = re.split(r'[\t,]', line)
-        row = [item.strip() for item in row if item.strip()]
-        if row:
-            table_data.append(row)
-    return table_data
+    rows = (_CELL_PATTERN.findall(line) for line in text.strip().split('\n'))
+    return [row for row in rows if row]
 
 def append_to_sheet(spreadsheet_id, range_name, values):
     """
@@ -101,25 +160,146 @@ def append_to_sheet(spreadsheet_id, range_name, values):
         spreadsheetId=spreadsheet_id,
         range=range_name,
         valueInputOption='RAW',
+        insertDataOption='INSERT_ROWS',
         body=body
     ).execute()
     return result
 
-def extract_text_from_image(image_data):
+# スプレッドシートへの送信待ちの行
+_pending_rows = []
+_pending_lock = threading.Lock()
+_flush_requested = threading.Event()
+# スプレッドシートへの書き込みを一つずつ行うためのロックと、書き込みスレッドの停止フラグ
+_flush_lock = threading.Lock()
+_flusher_stopping = threading.Event()
+
+def enqueue_rows(values):
+    """
+    スプレッドシートに追加する行を送信待ちキューに積む
+    1枚の画像分の行はまとめて積むので、他の画像の行と混ざることはない
+    キューが上限に達している場合は積まずにFalseを返す
+    """
+    with _pending_lock:
+        if len(_pending_rows) + len(values) > SHEET_MAX_PENDING_ROWS:
+            logger.error(f"Spreadsheet queue is full, rejecting {len(values)} rows")
+            return False
+        _pending_rows.extend(values)
+        if len(_pending_rows) >= SHEET_FLUSH_MAX_ROWS:
+            _flush_requested.set()
+    return True
+
+def _is_retryable(error):
     """
-    画像からテキストを抽出する関数
+    時間をおけば成功する見込みのあるエラー（429/5xx/タイムアウト/接続エラー）かどうかを返す
+    """
+    if isinstance(error, HttpError):
+        return error.resp.status == 429 or error.resp.status >= 500
+    return isinstance(error, (socket.timeout, TimeoutError, ConnectionError))
+
+def flush_pending_rows():
+    """
+    送信待ちの行を1回のAPI呼び出しでまとめてスプレッドシートに追加する
+    httplib2はスレッドセーフではないため、書き込みは_flush_lockで一つずつ行う
+    """
+    with _flush_lock:
+        with _pending_lock:
+            if not _pending_rows:
+                return
+            batch = _pending_rows[:]
+            _pending_rows.clear()
+
+        for attempt in range(SHEET_APPEND_RETRIES + 1):
+            try:
+                append_to_sheet(SPREADSHEET_ID, RANGE_NAME, batch)
+                logger.info(f"Added {len(batch)} rows to spreadsheet")
+                return
+            except Exception as e:
+                if attempt < SHEET_APPEND_RETRIES and _is_retryable(e):
+                    delay = SHEET_RETRY_BACKOFF * 2 ** attempt
+                    logger.warning(f"Error adding to spreadsheet, retrying in {delay}s: {str(e)}")
+                    time.sleep(delay)
+                    continue
+                # 回復しないエラーや再試行の上限に達した場合は、行を記録して破棄する
+                logger.error(f"Error adding to spreadsheet, dropping {len(batch)} rows: {str(e)}")
+                logger.error(f"Dropped rows: {batch}")
+                return
+
+def _sheet_flusher():
+    """
+    一定間隔、または行数が閾値に達したときに送信待ちの行を書き込む
+    """
+    while not _flusher_stopping.is_set():
+        _flush_requested.wait(SHEET_FLUSH_INTERVAL)
+        _flush_requested.clear()
+        if _flusher_stopping.is_set():
+            break
+        flush_pending_rows()
+
+def _stop_sheet_flusher():
+    """
+    終了時に書き込みスレッドを止め、残っている行を書き込む
+    """
+    _flusher_stopping.set()
+    _flush_requested.set()
+    # 書き込み中のバッチがあれば、終わるのを待ってから最後の書き込みを行う
+    _flusher_thread.join()
+    flush_pending_rows()
+
+_flusher_thread = threading.Thread(target=_sheet_flusher, daemon=True)
+_flusher_thread.start()
+atexit.register(_stop_sheet_flusher)
+
+def downscale_image(image_data, mime_type):
+    """
+    長辺がMAX_IMAGE_SIDEを超える画像を縮小し、JPEGに変換したバイト列とMIMEタイプを返す
+    小さい画像や読み込めない画像は、デコードせずにそのまま返す
     """
     try:
-        # 画像データからPIL Imageオブジェクトを作成
+        # Image.openはヘッダーだけを読むため、ここではまだデコードしない
         image = Image.open(io.BytesIO(image_data))
+        if max(image.size) <= MAX_IMAGE_SIDE:
+            return image_data, mime_type
         
-        # Geminiモデルの初期化
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # JPEGはデコード時に縮小できるので、必要な解像度だけデコードする
+        image.draft('RGB', (MAX_IMAGE_SIDE, MAX_IMAGE_SIDE))
+        # 再エンコードでEXIFが失われるため、向きの情報はここで画素に反映しておく
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+        
+        # 透過部分が黒くならないよう、白い背景に重ねてからJPEGにする
+        if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        
+        buffer = io.BytesIO()
+        image.convert('RGB').save(buffer, format='JPEG', quality=RESIZED_JPEG_QUALITY)
+        return buffer.getvalue(), 'image/jpeg'
+    
+    except Exception as e:
+        logger.warning(f"Could not downscale image, sending original: {str(e)}")
+        return image_data, mime_type
+
+def extract_table_from_image(image_data, mime_type):
+    """
+    画像からテキストを抽出し、表形式のデータとして返す関数
+    画像はデコードせず、バイト列とMIMEタイプのままGeminiに渡す
+    """
+    try:
+        image = {'mime_type': mime_type, 'data': image_data}
         
         # 画像からテキストを抽出
-        response = model.generate_content(["この画像に含まれるテキストを抽出して表形式で出力してください。各列はタブまたはカンマで区切ってください。", image])
+        response = _GEMINI_MODEL.generate_content(["この画像に含まれるテキストを抽出して表形式で出力してください。各列はタブまたはカンマで区切ってください。", image])
+        text = response.text
+        
+        # 出力トークンの上限で打ち切られた場合、最後の行は途中までなので書き込まない
+        if response.candidates[0].finish_reason.name == 'MAX_TOKENS':
+            logger.warning("Gemini output was truncated, dropping the last line")
+            text = text.rpartition('\n')[0]
         
-        return response.text
+        # テキストを表形式に変換
+        return convert_to_table(text)
     
     except Exception as e:
         logger.error(f"Error extracting text from image: {str(e)}")
@@ -127,18 +307,39 @@ def extract_text_from_image(image_data):
 
 # 保存済みメッセージIDを読み込む
 def load_saved_messages():
+    """
+    ファイルから直近の保存済みメッセージIDを読み込み、古い順に並んだOrderedDictで返す
+    """
+    saved_messages = OrderedDict()
     if os.path.exists(SAVED_MESSAGES_FILE):
         with open(SAVED_MESSAGES_FILE, 'r') as f:
-            return json.load(f)
-    return []
+            for line in f:
+                message_id = line.strip()
+                if message_id:
+                    saved_messages[message_id] = None
+                    if len(saved_messages) > MAX_SAVED_MESSAGES:
+                        saved_messages.popitem(last=False)
+    return saved_messages
 
 # 保存済みメッセージIDを保存する
-def save_message_id(message_id):
-    saved_messages = load_saved_messages()
-    if message_id not in saved_messages:
-        saved_messages.append(message_id)
-        with open(SAVED_MESSAGES_FILE, 'w') as f:
-            json.dump(saved_messages, f)
+def save_message_id(message_id, saved_messages):
+    """
+    読み込み済みのメッセージIDの集合に追加し、ファイルには1行だけ追記する
+    """
+    with _seen_ids_lock:
+        if message_id in saved_messages:
+            return
+        saved_messages[message_id] = None
+        if len(saved_messages) > MAX_SAVED_MESSAGES:
+            saved_messages.popitem(last=False)
+        with open(SAVED_MESSAGES_FILE, 'a') as f:
+            f.write(message_id + '\n')
+
+# 起動時に一度だけ読み込んだ保存済みメッセージID
+_seen_ids = load_saved_messages()
+_seen_ids_lock = threading.Lock()
+# ワーカーで処理中のメッセージID（_seen_ids_lockで保護する）
+_in_flight_ids = set()
 
 @app.route("/callback", methods=['POST'])
 def callback():
@@ -151,8 +352,9 @@ def callback():
     logger.info("Request body: " + body)
     logger.info("Signature: " + signature)
 
+    # 署名の検証とパースだけを行い、イベントの処理はワーカーに任せてすぐに応答する
     try:
-        handler.handle(body, signature)
+        events = parser.parse(body, signature)
     except InvalidSignatureError as e:
         logger.error(f"Invalid signature: {str(e)}")
         abort(400)
@@ -160,95 +362,128 @@ def callback():
         logger.error(f"Unexpected error: {str(e)}")
         abort(500)
 
+    for event in events:
+        if isinstance(event, MessageEvent) and isinstance(event.message, ImageMessageContent):
+            handle_image_message(event)
+
     return 'OK'
 
-@handler.add(MessageEvent, message=ImageMessageContent)
-def handle_image_message(event):
+def reply_text(event, text):
+    """
+    イベントにテキストで返信する
+    リプライトークンが失効している場合はプッシュメッセージで送る
+    """
     try:
-        message_id = event.message.id
-        logger.info(f"Received image message: {message_id}")
-        
-        # 既に保存済みのメッセージかチェック
-        saved_messages = load_saved_messages()
-        if message_id in saved_messages:
+        _LINE_MESSAGING.reply_message(
+            ReplyMessageRequest(
+                reply_token=event.reply_token,
+                messages=[TextMessage(text=text)]
+            )
+        )
+    except ApiException as e:
+        logger.warning(f"Reply failed, falling back to push: {str(e)}")
+        source = event.source
+        to = (getattr(source, 'group_id', None)
+              or getattr(source, 'room_id', None)
+              or source.user_id)
+        try:
+            _LINE_MESSAGING.push_message(
+                PushMessageRequest(to=to, messages=[TextMessage(text=text)])
+            )
+        except ApiException as e:
+            logger.error(f"Error pushing message: {str(e)}")
+
+def handle_image_message(event):
+    """
+    画像メッセージの処理をワーカーに登録する
+    処理済みまたは処理中のメッセージ（LINEからの再送など）はここで読み飛ばす
+    """
+    message_id = event.message.id
+    logger.info(f"Received image message: {message_id}")
+    
+    # 既に保存済み、または処理中のメッセージかチェック
+    with _seen_ids_lock:
+        if message_id in _seen_ids or message_id in _in_flight_ids:
             logger.info(f"Image already processed: {message_id}")
             return
-        
+        _in_flight_ids.add(message_id)
+    
+    future = _EXECUTOR.submit(_process_image, event)
+    future.add_done_callback(functools.partial(_finish_in_flight, message_id))
+    future.add_done_callback(_log_worker_error)
+
+def _finish_in_flight(message_id, future):
+    """
+    処理が終わったメッセージIDを処理中の集合から外す
+    失敗した場合は保存済みにならないので、LINEからの再送で再び処理される
+    """
+    with _seen_ids_lock:
+        _in_flight_ids.discard(message_id)
+
+def _log_worker_error(future):
+    """
+    ワーカーで捕捉されなかった例外をログに残す
+    """
+    error = future.exception()
+    if error is not None:
+        logger.error("Unhandled error in image worker", exc_info=error)
+
+def _process_image(event):
+    """
+    画像をダウンロードしてテキストを抽出し、スプレッドシートへの追加と返信を行う
+    """
+    message_id = event.message.id
+    try:
         # 画像のコンテンツを取得
-        headers = {
-            'Authorization': f'Bearer {os.getenv("LINE_CHANNEL_ACCESS_TOKEN")}'
-        }
         url = f'https://api-data.line.me/v2/bot/message/{message_id}/content'
         
         # 画像をダウンロード
-        response = requests.get(url, headers=headers)
+        response = _LINE_SESSION.get(url, timeout=LINE_CONTENT_TIMEOUT)
+        if response.status_code != 200:
+            logger.error(f"Failed to download image. Status code: {response.status_code}")
+            raise Exception(f"Failed to download image. Status code: {response.status_code}")
         
-        if response.status_code == 200:
-            # 画像データを取得
-            image_data = response.content
-            
-            # 画像からテキストを抽出
-            extracted_text = extract_text_from_image(image_data)
+        # 画像データとMIMEタイプを取得
+        image_data = response.content
+        mime_type = response.headers.get('Content-Type', 'image/jpeg')
+        
+        # 大きな画像は送信量とトークン数を減らすため縮小する
+        image_data, mime_type = downscale_image(image_data, mime_type)
+        
+        # 画像からテキストを抽出して表形式に変換
+        table_data = extract_table_from_image(image_data, mime_type)
+        
+        if table_data:
+            # 現在の日時を取得
+            current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             
-            if extracted_text:
-                # テキストを表形式に変換
-                table_data = convert_to_table(extracted_text)
-                
-                # スプレッドシートにデータを追加
-                SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')
-                RANGE_NAME = 'シート1!A1'
-                
-                # 現在の日時を取得
-                current_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                # スプレッドシートに追加するデータ
-                values = [[current_time, f"LINE Message ID: {message_id}"]]
-                values.extend(table_data)
-                
-                try:
-                    append_to_sheet(SPREADSHEET_ID, RANGE_NAME, values)
-                    logger.info("Data added to spreadsheet successfully")
-                    
-                    # ユーザーに成功を通知
-                    with ApiClient(configuration) as api_client:
-                        messaging_api = MessagingApi(api_client)
-                        messaging_api.reply_message(
-                            ReplyMessageRequest(
-                                reply_token=event.reply_token,
-                                messages=[TextMessage(text='画像からテキストを抽出し、スプレッドシートに保存しました。')]
-                            )
-                        )
-                except Exception as e:
-                    logger.error(f"Error adding to spreadsheet: {str(e)}")
-                    raise
-            else:
-                # テキスト抽出に失敗した場合
-                with ApiClient(configuration) as api_client:
-                    messaging_api = MessagingApi(api_client)
-                    messaging_api.reply_message(
-                        ReplyMessageRequest(
-                            reply_token=event.reply_token,
-                            messages=[TextMessage(text='テキストの抽出に失敗しました。')]
-                        )
-                    )
+            # スプレッドシートに追加するデータ
+            values = [[current_time, f"LINE Message ID: {message_id}"]]
+            values.extend(table_data)
             
-            # メッセージIDを保存済みとして記録
-            save_message_id(message_id)
+            # スプレッドシートへの書き込みはバックグラウンドでまとめて行う
+            if not enqueue_rows(values):
+                raise Exception("Spreadsheet queue is full")
+            logger.info("Data queued for spreadsheet")
             
+            reply = '画像からテキストを抽出し、スプレッドシートに保存しました。'
         else:
-            logger.error(f"Failed to download image. Status code: {response.status_code}")
-            raise Exception(f"Failed to download image. Status code: {response.status_code}")
-            
+            # テキスト抽出に失敗した場合
+            reply = 'テキストの抽出に失敗しました。'
+    
     except Exception as e:
         logger.error(f"Error handling image message: {str(e)}")
-        with ApiClient(configuration) as api_client:
-            messaging_api = MessagingApi(api_client)
-            messaging_api.reply_message(
-                ReplyMessageRequest(
-                    reply_token=event.reply_token,
-                    messages=[TextMessage(text='処理中にエラーが発生しました。')]
-                )
-            )
+        reply = '処理中にエラーが発生しました。'
+    
+    else:
+        # メッセージIDを保存済みとして記録
+        save_message_id(message_id, _seen_ids)
+    
+    finally:
+        # 結果にかかわらず、ユーザーへの返信はここで一度だけ行う
+        reply_text(event, reply)
 
 if __name__ == "__main__":
-    app.run(host='0.0.0.0', port=8000, debug=True) 
\ No newline at end of file
+    # ローカル確認用。本番は Procfile の gunicorn（gthreadワーカー）で起動する
+    #   gunicorn -w 1 -k gthread --threads 16 -b 0.0.0.0:8000 app:app
+    app.run(host='0.0.0.0', port=8000) 
\ No newline at end of file
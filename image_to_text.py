@@ -1,43 +1,64 @@
 import google.generativeai as genai
-from PIL import Image
 import os
 import json
 from dotenv import load_dotenv
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
+import google_auth_httplib2
+import httplib2
 import datetime
 import re
+import mimetypes
+import functools
 
 # .envファイルから環境変数を読み込む
 load_dotenv()
 
+# 必須の環境変数（未設定なら起動時にKeyErrorで止める）
+GOOGLE_API_KEY = os.environ['GOOGLE_API_KEY']
+GOOGLE_CREDENTIALS = os.environ['GOOGLE_CREDENTIALS']
+SPREADSHEET_ID = os.environ['SPREADSHEET_ID']
+
 # Gemini APIの設定
-GOOGLE_API_KEY = os.getenv('GOOGLE_API_KEY')
 genai.configure(api_key=GOOGLE_API_KEY)
 
+# OCR用のGeminiモデル（プロセス内で使い回す。出力を安定させるため温度は0）
+_GEMINI_MODEL = genai.GenerativeModel(
+    'gemini-1.5-flash',
+    generation_config={'temperature': 0.0, 'max_output_tokens': 2048}
+)
+
 # Google Sheets APIのスコープ
 SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
+# Google Sheets APIへのリクエストのタイムアウト（秒）
+SHEETS_HTTP_TIMEOUT = 10
+
+# 表のセル（タブまたはカンマで区切られ、前後の空白を除いた空でない文字列）
+_CELL_PATTERN = re.compile(r'[^\t,\s](?:[^\t,\n]*[^\t,\s])?')
+
+@functools.lru_cache(maxsize=1)
 def get_google_sheets_service():
     """
     Google Sheets APIのサービスアカウント認証を行い、サービスオブジェクトを返す
+    認証とクライアント構築はプロセスごとに一度だけ行い、以降はキャッシュを再利用する
     
     Returns:
         googleapiclient.discovery.Resource: Google Sheets APIのサービスオブジェクト
     """
-    # サービスアカウントの認証情報を環境変数から取得
-    credentials_json = os.getenv('GOOGLE_CREDENTIALS')
-    if not credentials_json:
-        raise ValueError("GOOGLE_CREDENTIALS environment variable is not set")
-    
-    # JSON文字列を辞書に変換
-    credentials_info = json.loads(credentials_json)
+    # 環境変数のJSON文字列を辞書に変換
+    credentials_info = json.loads(GOOGLE_CREDENTIALS)
     
     # 認証情報を作成
     credentials = service_account.Credentials.from_service_account_info(
         credentials_info, scopes=SCOPES)
     
-    return build('sheets', 'v4', credentials=credentials)
+    # 同梱のディスカバリードキュメントを使い、ネットワーク経由の取得を避ける
+    # 認証付きのHTTPクライアントを一つ作り、以降のリクエストで接続を使い回す
+    authed_http = google_auth_httplib2.AuthorizedHttp(
+        credentials, http=httplib2.Http(timeout=SHEETS_HTTP_TIMEOUT))
+    return build('sheets', 'v4', http=authed_http,
+                 cache_discovery=False, static_discovery=True)
 
 def convert_to_table(text):
     """
@@ -49,20 +70,11 @@ def convert_to_table(text):
     Returns:
         list: 表形式のデータ（各行がリストのリスト）
     """
-    # 行ごとに分割
-    lines = text.strip().split('\n')
-    
-    # 各行をタブまたはカンマで分割
-    table_data = []
-    for line in lines:
-        # タブまたはカンマで分割
-        row = re.split(r'[\t,]', line)
-        # 空の要素を削除
-        row = [item.strip() for item in row if item.strip()]
-        if row:  # 空の行は追加しない
-            table_data.append(row)
+    # 行ごとに分割し、各行から空でないセルを取り出す
+    rows = (_CELL_PATTERN.findall(line) for line in text.strip().split('\n'))
     
-    return table_data
+    # 空の行は追加しない
+    return [row for row in rows if row]
 
 def append_to_sheet(spreadsheet_id, range_name, values):
     """
@@ -81,6 +93,7 @@ def append_to_sheet(spreadsheet_id, range_name, values):
         spreadsheetId=spreadsheet_id,
         range=range_name,
         valueInputOption='RAW',
+        insertDataOption='INSERT_ROWS',
         body=body
     ).execute()
     return result
@@ -96,14 +109,13 @@ def extract_text_from_image(image_path):
         str: 抽出されたテキスト
     """
     try:
-        # 画像を開く
-        image = Image.open(image_path)
-        
-        # Geminiモデルの初期化（最新のモデルを使用）
-        model = genai.GenerativeModel('gemini-1.5-flash')
+        # 画像はデコードせず、バイト列とMIMEタイプのままGeminiに渡す
+        mime_type = mimetypes.guess_type(image_path)[0] or 'image/jpeg'
+        with open(image_path, 'rb') as f:
+            image = {'mime_type': mime_type, 'data': f.read()}
         
         # 画像からテキストを抽出
-        response = model.generate_content(["この画像に含まれるテキストを抽出して表形式で出力してください。各列はタブまたはカンマで区切ってください。", image])
+        response = _GEMINI_MODEL.generate_content(["この画像に含まれるテキストを抽出して表形式で出力してください。各列はタブまたはカンマで区切ってください。", image])
         
         return response.text
     
@@ -121,8 +133,7 @@ if __name__ == "__main__":
     table_data = convert_to_table(extracted_text)
     
     # スプレッドシートにデータを追加
-    SPREADSHEET_ID = os.getenv('SPREADSHEET_ID')  # .envファイルからスプレッドシートIDを取得
-    RANGE_NAME = 'シート1!A1'  # データを追加する開始位置
+    RANGE_NAME = 'シート1'  # データを追加するシート
     
     # 現在の日時を取得
     current_time = datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')